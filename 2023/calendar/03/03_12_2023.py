@@ -79,9 +79,14 @@ adjacent to one part number.) Adding up all of the gear ratios produces 467835.
 What is the sum of all of the gear ratios in your engine schematic?
 
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Iterable, Iterator
 from pathlib import Path
+from bisect import bisect_right
+import re
 from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
 
 
 @dataclass
@@ -91,8 +96,8 @@ class PartNumber:
     columns: List[int]
 
     @property
-    def column_range(self) -> List[int]:
-        return list(range(max(0, min(self.columns) - 1), max(self.columns) + 2))
+    def column_range(self) -> range:
+        return range(max(0, min(self.columns) - 1), max(self.columns) + 2)
 
 
 @dataclass
@@ -146,12 +151,61 @@ class Row:
 
 class Engine:
     def __init__(self, data: List[str]):
-        self.rows: Dict[int, Row] = {}
-        self._parse_data(data)
-
-    def _parse_data(self, data: List[str]):
-        for row_number, row in enumerate(data):
-            self.rows[row_number] = Row(row, row_number)
+        self.data = data
+        self.grid: np.ndarray = self._build_grid(data)
+        self.digits: np.ndarray = (self.grid >= ord("0")) & (self.grid <= ord("9"))
+        self.symbols: np.ndarray = ~self.digits & (self.grid != ord("."))
+        self.labels, self.numbers = self._label_numbers()
+        self.adjacent: np.ndarray = self._dilate(self.symbols)
+        # The label grid with a border of zeros, so every cell has 8 neighbours
+        self.padded_labels: np.ndarray = np.pad(self.labels, 1)
+
+    @cached_property
+    def rows(self) -> Dict[int, Row]:
+        # Only parts, gears and part_numbers need the Row objects, so they are
+        # only parsed when one of those is first used
+        return {
+            row_number: Row(row, row_number) for row_number, row in enumerate(self.data)
+        }
+
+    @staticmethod
+    def _build_grid(data: List[str]) -> np.ndarray:
+        # Pad every row with "." so the schematic is a rectangular byte array
+        width = max((len(row) for row in data), default=0)
+        raw = "".join(row.ljust(width, ".") for row in data).encode()
+        return np.frombuffer(raw, dtype=np.uint8).reshape(len(data), width)
+
+    def _label_numbers(self) -> Tuple[np.ndarray, np.ndarray]:
+        # A number starts on a digit whose left neighbour is not a digit, and ends
+        # on a digit whose right neighbour is not a digit. Label 0 means no number.
+        left = np.zeros_like(self.digits)
+        left[:, 1:] = self.digits[:, :-1]
+        right = np.zeros_like(self.digits)
+        right[:, :-1] = self.digits[:, 1:]
+        starts = np.flatnonzero(self.digits & ~left)
+        ends = np.flatnonzero(self.digits & ~right) + 1
+
+        labels = np.zeros(self.grid.size, dtype=np.int64)
+        labels[starts] = 1
+        labels = np.cumsum(labels).reshape(self.grid.shape) * self.digits
+
+        flat = self.grid.ravel()
+        numbers = np.zeros(len(starts) + 1, dtype=np.int64)
+        numbers[1:] = [
+            int(flat[start:end].tobytes()) for start, end in zip(starts, ends)
+        ]
+        return labels, numbers
+
+    @staticmethod
+    def _dilate(mask: np.ndarray) -> np.ndarray:
+        # Grow the mask by one cell in every direction, diagonals included
+        height, width = mask.shape
+        padded = np.pad(mask, 1)
+        dilated = np.zeros_like(mask)
+        for d_row in range(3):
+            for d_column in range(3):
+                dilated |= padded[d_row : d_row + height, d_column : d_column + width]
+        return dilated
 
     @property
     def parts(self) -> List[Part]:
@@ -160,8 +214,9 @@ class Engine:
             parts.extend(row.parts)
         return parts
 
-    @property
+    @cached_property
     def part_numbers(self) -> List[PartNumber]:
+        # Ordered like the labels: part_numbers[label - 1] has that label
         part_numbers: List[PartNumber] = []
         for row in self.rows.values():
             part_numbers.extend(row.part_numbers)
@@ -171,22 +226,14 @@ class Engine:
         return self.rows.get(row_number, None)
 
     def is_part_number(self, part_number: PartNumber) -> bool:
-        # Check the row, the row above, and the row below for a part
-        for row_number in range(part_number.row - 1, part_number.row + 2):
-            if row := self.get_row(row_number):
-                # For all parts in that row, see if it's in the column range
-                for part in row.parts:
-                    if part.column in part_number.column_range:
-                        return True
-        return False
+        return bool(self.adjacent[part_number.row, part_number.columns].any())
 
     def evaluate(self):
-        part_number_sum: int = 0
-        # Evaluate every part number in the engine
-        for part_number in self.part_numbers:
-            if self.is_part_number(part_number):
-                part_number_sum += part_number.number
-        return part_number_sum
+        # Every label touching the dilated symbol mask is a part number
+        is_part = np.zeros(len(self.numbers), dtype=bool)
+        is_part[self.labels[self.adjacent & self.digits]] = True
+        is_part[0] = False
+        return int(self.numbers[is_part].sum())
 
     @property
     def gears(self) -> List[Part]:
@@ -197,24 +244,98 @@ class Engine:
                     gear_list.append(part)
         return gear_list
 
+    def neighbour_labels(self, rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        # Look up the number labels of the 3x3 block around each (row, column)
+        return np.stack(
+            [
+                self.padded_labels[rows + d_row, columns + d_column]
+                for d_row in range(3)
+                for d_column in range(3)
+            ],
+            axis=-1,
+        )
+
     def gear_part_numbers(self, gear: Part) -> List[PartNumber]:
-        part_number_list: List[PartNumber] = []
-        for row_number in range(gear.row - 1, gear.row + 2):
-            if row := self.get_row(row_number):
-                for part_number in row.part_numbers:
-                    if gear.column in part_number.column_range:
-                        part_number_list.append(part_number)
-        return part_number_list
+        part_numbers = self.part_numbers
+        labels = self.neighbour_labels(np.array(gear.row), np.array(gear.column))
+        return [part_numbers[label - 1] for label in np.unique(labels) if label]
 
     def gear_ratios(self) -> int:
-        gear_ratio_sum: int = 0
-        for gear in self.gears:
-            part_number_list = self.gear_part_numbers(gear)
-            if len(part_number_list) == 2:
-                gear_ratio_sum += (
-                    part_number_list[0].number * part_number_list[1].number
-                )
-        return gear_ratio_sum
+        rows, columns = np.nonzero(self.grid == ord("*"))
+        labels = np.sort(self.neighbour_labels(rows, columns), axis=1)
+        # Count the distinct non-zero labels around every gear
+        distinct = (labels[:, 0] != 0) + (
+            (labels[:, 1:] != labels[:, :-1]) & (labels[:, 1:] != 0)
+        ).sum(axis=1)
+        gears = labels[distinct == 2]
+        first = gears[:, -1]
+        second = np.where(gears == 0, first[:, None], gears).min(axis=1)
+        return int((self.numbers[first] * self.numbers[second]).sum())
+
+
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+class WindowRow:
+    """A schematic row and its number spans, as held by `stream_engine`"""
+
+    def __init__(self, row: str):
+        self.row = row
+        self.spans: List[Tuple[int, int, int]] = [
+            (match.start(), match.end(), int(match.group()))
+            for match in NUMBER_PATTERN.finditer(row)
+        ]
+        self.starts: List[int] = [start for start, _, _ in self.spans]
+
+    def has_symbol(self, start: int, end: int) -> bool:
+        return any(not char.isdigit() and char != "." for char in self.row[start:end])
+
+    def numbers_touching(self, column: int) -> List[int]:
+        # Spans never overlap, so at most two can touch the three cells around
+        # the column: the last one starting at or before column + 1, and the one
+        # before it
+        numbers: List[int] = []
+        index = bisect_right(self.starts, column + 1)
+        for start, end, number in self.spans[max(0, index - 2) : index]:
+            if start - 1 <= column <= end:
+                numbers.append(number)
+        return numbers
+
+
+def stream_engine(lines: Iterable[str]) -> Iterator[Tuple[int, int]]:
+    """Evaluate a schematic while reading it, holding only three rows at a time.
+    Yields the part number sum and gear ratio sum contributed by each row.
+    """
+    empty = WindowRow("")
+    previous, current = empty, None
+    for line in lines:
+        upcoming = WindowRow(line)
+        if current is not None:
+            yield _evaluate_window(previous, current, upcoming)
+            previous = current
+        current = upcoming
+    if current is not None:
+        yield _evaluate_window(previous, current, empty)
+
+
+def _evaluate_window(
+    above: WindowRow, row: WindowRow, below: WindowRow
+) -> Tuple[int, int]:
+    part_number_sum: int = 0
+    for start, end, number in row.spans:
+        low, high = max(0, start - 1), end + 1
+        if any(window.has_symbol(low, high) for window in (above, row, below)):
+            part_number_sum += number
+
+    gear_ratio_sum: int = 0
+    for column, char in enumerate(row.row):
+        if char == "*":
+            numbers: List[int] = []
+            for window in (above, row, below):
+                numbers.extend(window.numbers_touching(column))
+            if len(numbers) == 2:
+                gear_ratio_sum += numbers[0] * numbers[1]
+    return part_number_sum, gear_ratio_sum
 
 
 def part_one(data: List[str]) -> int:
@@ -260,3 +381,11 @@ if __name__ == "__main__":
     # Completed Part 2 at 9:59PM CST (8 minutes)
 
     # Total time: 44 minutes
+
+    # Streaming mode, for schematics too tall to hold in memory
+    with open(f"{WORKING_DIR}/data.csv", "r", encoding="utf-8") as handle:
+        part_sum, gear_sum = map(
+            sum, zip(*stream_engine(line.rstrip("\n") for line in handle))
+        )
+    print(f"Part One (Streaming): {part_sum}")
+    print(f"Part Two (Streaming): {gear_sum}")
@@ -105,8 +105,17 @@ Including the original set of scratchcards, how many total scratchcards do you e
 with?
 
 """
-from typing import List, Set
+from typing import List, Set, Iterable, Iterator
 from pathlib import Path
+from collections import deque
+from functools import cached_property
+
+import numpy as np
+
+# Card numbers are below 100, so each set of numbers fits in two 64-bit words
+WORDS: int = 2
+WORD_MASK: int = (1 << 64) - 1
+POPCOUNT: np.ndarray = np.array([bin(byte).count("1") for byte in range(256)])
 
 
 class Card:
@@ -114,7 +123,6 @@ class Card:
         self.id = None
         self.winning_numbers: Set[int] = {}
         self.numbers: List[int] = []
-        self.count: int = 1
         self._parse_card_str(card_str)
 
     def _parse_card_str(self, card_str: str):
@@ -126,33 +134,90 @@ class Card:
         )
         self.numbers = [int(num) for num in numbers_str.strip().split()]
 
-    @property
+    @staticmethod
+    def _to_bitset(numbers: Iterable[int]) -> int:
+        bitset: int = 0
+        for num in numbers:
+            if not 0 <= num < 64 * WORDS:
+                raise ValueError(f"Card number {num} does not fit in the bitset")
+            bitset |= 1 << num
+        return bitset
+
+    @cached_property
+    def winning_bits(self) -> int:
+        return self._to_bitset(self.winning_numbers)
+
+    @cached_property
+    def number_bits(self) -> int:
+        return self._to_bitset(self.numbers)
+
+    @cached_property
     def matches(self) -> int:
-        matches: int = 0
-        for num in self.numbers:
-            if num in self.winning_numbers:
-                matches += 1
-        return matches
+        return bin(self.winning_bits & self.number_bits).count("1")
 
     @property
     def worth(self) -> int:
         return 2 ** (self.matches - 1) if self.matches > 0 else 0
 
 
+class Deck:
+    def __init__(self, data: Iterable[str]):
+        self.cards: List[Card] = [Card(card) for card in data]
+        self.winning_bits: np.ndarray = self._pack(
+            [card.winning_bits for card in self.cards]
+        )
+        self.number_bits: np.ndarray = self._pack(
+            [card.number_bits for card in self.cards]
+        )
+
+    @staticmethod
+    def _pack(bitsets: List[int]) -> np.ndarray:
+        return np.array(
+            [
+                [(bitset >> (64 * word)) & WORD_MASK for word in range(WORDS)]
+                for bitset in bitsets
+            ],
+            dtype=np.uint64,
+        ).reshape(-1, WORDS)
+
+    @cached_property
+    def matches(self) -> np.ndarray:
+        # AND the bitsets of every card at once, then popcount them byte by byte
+        common = self.winning_bits & self.number_bits
+        return POPCOUNT[common.view(np.uint8)].sum(axis=1)
+
+    @property
+    def worth(self) -> int:
+        matches = self.matches
+        worth = np.where(matches > 0, 1 << np.maximum(matches - 1, 0), 0)
+        return int(worth.sum())
+
+
 def part_one(data: List[str]) -> int:
-    cards: List[Card] = [Card(card) for card in data]
-    worth: int = sum([card.worth for card in cards])
-    return worth
-
-
-def part_two(data: List[str]) -> int:
-    cards: List[Card] = [Card(card) for card in data]
-    for i, card in enumerate(cards):
-        rest_of_cards: List[Card] = cards[i + 1 :]
-        for j in range(card.matches):
-            if j < len(rest_of_cards):
-                rest_of_cards[j].count += 1 * card.count
-    return sum([card.count for card in cards])
+    return Deck(data).worth
+
+
+def card_counts(matches: Iterable[int]) -> Iterator[int]:
+    """Yield the number of copies held of each card, given each card's match count.
+    Copies won by a card are recorded as a running difference array in a ring
+    buffer that is only as long as the largest match count seen so far.
+    """
+    # pending[k] is the change in copies won between card i + k and card i + k - 1
+    pending: deque = deque()
+    copies: int = 0
+    for match_count in matches:
+        copies += pending.popleft() if pending else 0
+        count = 1 + copies
+        if match_count:
+            while len(pending) < match_count + 1:
+                pending.append(0)
+            pending[0] += count
+            pending[match_count] -= count
+        yield count
+
+
+def part_two(data: Iterable[str]) -> int:
+    return sum(card_counts(Card(line).matches for line in data))
 
 
 if __name__ == "__main__":
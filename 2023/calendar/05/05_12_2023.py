@@ -153,8 +153,12 @@ almanac. What is the lowest location number that corresponds to any of the initi
 seed numbers?
 
 """
-from typing import List, NamedTuple
+from typing import List, NamedTuple, Optional, Dict, Tuple
 from pathlib import Path
+from bisect import bisect_right
+from functools import cached_property
+
+import numpy as np
 
 
 class Range(NamedTuple):
@@ -193,43 +197,72 @@ class RangeMap:
         return key + self.delta
 
 
-def propagate_range(range_: Range, range_maps: List[RangeMap]) -> List["Range"]:
-    """Find the intersections of one range with a list of other (sorted) ranges."""
-    ranges: List[Range] = []
-    current_start = range_.start
-
-    for r in range_maps:
-        if r.source_range.end < range_.start:
-            # The range is before the start of the original range
-            continue
-
-        if r.source_range.start > range_.end:
-            # The range is beyond the end of the original range
-            break
+class RangeSet:
+    """A set of ranges, kept sorted with overlapping and touching ranges merged."""
 
-        if r.source_range.start > current_start:
-            # Add segment before the current range starts, if any
-            ranges.append(Range(current_start, r.source_range.start - current_start))
-
-        # Add the intersecting segment
-        intersect_start = max(current_start, r.source_range.start)
-        intersect_end = min(range_.end, r.source_range.end)
-        if intersect_end >= intersect_start:
-            ranges.append(
-                Range(intersect_start + r.delta, intersect_end - intersect_start + 1)
-            )
-
-        # Update the current start position for the next iteration
-        current_start = intersect_end + 1
-
-        if current_start > range_.end:
-            break
+    def __init__(self, ranges: List[Range]):
+        self.ranges: List[Range] = []
+        for range_ in sorted(ranges, key=lambda r: r.start):
+            if range_.length <= 0:
+                continue
+            if self.ranges and range_.start <= self.ranges[-1].end + 1:
+                last = self.ranges[-1]
+                end = max(last.end, range_.end)
+                self.ranges[-1] = Range(last.start, end - last.start + 1)
+            else:
+                self.ranges.append(range_)
 
-    # Add the remaining segment, if any
-    if current_start <= range_.end:
-        ranges.append(Range(current_start, range_.end - current_start + 1))
+    def __len__(self) -> int:
+        return len(self.ranges)
 
-    return ranges
+    @property
+    def lowest(self) -> int:
+        return self.ranges[0].start
+
+    def propagate(self, range_maps: List[RangeMap]) -> "RangeSet":
+        """Push every range through a list of sorted range maps in one sweep."""
+        ranges: List[Range] = []
+        first_map = 0
+        for range_ in self.ranges:
+            # The ranges are sorted, so maps ending before this range can be
+            # dropped for every range that follows
+            while (
+                first_map < len(range_maps)
+                and range_maps[first_map].source_range.end < range_.start
+            ):
+                first_map += 1
+
+            current_start = range_.start
+            map_ix = first_map
+            while map_ix < len(range_maps):
+                r = range_maps[map_ix]
+                map_ix += 1
+                if r.source_range.start > range_.end:
+                    # The range is beyond the end of the original range
+                    break
+
+                if r.source_range.start > current_start:
+                    # Add segment before the current range starts, if any
+                    ranges.append(
+                        Range(current_start, r.source_range.start - current_start)
+                    )
+                    current_start = r.source_range.start
+
+                # Add the intersecting segment
+                intersect_end = min(range_.end, r.source_range.end)
+                ranges.append(
+                    Range(current_start + r.delta, intersect_end - current_start + 1)
+                )
+                current_start = intersect_end + 1
+
+                if current_start > range_.end:
+                    break
+
+            # Add the remaining segment, if any
+            if current_start <= range_.end:
+                ranges.append(Range(current_start, range_.end - current_start + 1))
+
+        return RangeSet(ranges)
 
 
 class Almanac:
@@ -256,6 +289,97 @@ class Almanac:
                 return range_map[key]
         return key
 
+    @cached_property
+    def _lookup_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        starts = np.array([m.source_range.start for m in self.range_maps], np.int64)
+        ends = np.array([m.source_range.end for m in self.range_maps], np.int64)
+        deltas = np.array([m.delta for m in self.range_maps], np.int64)
+        return starts, ends, deltas
+
+    def convert(self, keys: np.ndarray) -> np.ndarray:
+        """Convert an array of keys at once, equivalent to `self[key]` for each."""
+        if not self.range_maps:
+            return keys
+        starts, ends, deltas = self._lookup_arrays
+        # Index of the last range map starting at or before each key
+        index = np.searchsorted(starts, keys, side="right") - 1
+        clipped = np.maximum(index, 0)
+        inside = (index >= 0) & (keys <= ends[clipped])
+        return keys + np.where(inside, deltas[clipped], 0)
+
+
+class PiecewiseMap:
+    """A map that shifts every key from starts[i] up to starts[i + 1] by deltas[i].
+
+    The first segment starts at 0 and the last one is unbounded, so every
+    non-negative key is covered.
+    """
+
+    def __init__(self, starts: List[int], deltas: List[int]):
+        self.starts: List[int] = []
+        self.deltas: List[int] = []
+        # Merge neighbouring segments that shift by the same amount
+        for start, delta in zip(starts, deltas):
+            if self.deltas and self.deltas[-1] == delta:
+                continue
+            self.starts.append(start)
+            self.deltas.append(delta)
+
+    @classmethod
+    def identity(cls) -> "PiecewiseMap":
+        return cls([0], [0])
+
+    @classmethod
+    def from_almanac(cls, almanac: Almanac) -> "PiecewiseMap":
+        starts: List[int] = []
+        deltas: List[int] = []
+        current_start = 0
+        for range_map in almanac.range_maps:
+            if range_map.source_range.start > current_start:
+                # Keys between two range maps are not converted
+                starts.append(current_start)
+                deltas.append(0)
+            starts.append(range_map.source_range.start)
+            deltas.append(range_map.delta)
+            current_start = range_map.source_range.end + 1
+        starts.append(current_start)
+        deltas.append(0)
+        return cls(starts, deltas)
+
+    def _segment_end(self, index: int) -> Optional[int]:
+        return self.starts[index + 1] if index + 1 < len(self.starts) else None
+
+    def compose(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        """Return the map that applies this map, then the other one."""
+        starts: List[int] = []
+        deltas: List[int] = []
+        for index, (start, delta) in enumerate(zip(self.starts, self.deltas)):
+            end = self._segment_end(index)
+            # Walk the segments of the other map that the image of this one covers
+            other_index = bisect_right(other.starts, start + delta) - 1
+            while True:
+                starts.append(max(other.starts[other_index] - delta, start))
+                deltas.append(delta + other.deltas[other_index])
+                other_index += 1
+                if other_index == len(other.starts):
+                    break
+                if end is not None and other.starts[other_index] - delta >= end:
+                    break
+        return PiecewiseMap(starts, deltas)
+
+    def __getitem__(self, key: int) -> int:
+        return key + self.deltas[bisect_right(self.starts, key) - 1]
+
+    def lowest(self, range_: Range) -> int:
+        """The lowest value the map takes over a range of keys."""
+        index = bisect_right(self.starts, range_.start) - 1
+        lowest = range_.start + self.deltas[index]
+        index += 1
+        while index < len(self.starts) and self.starts[index] <= range_.end:
+            lowest = min(lowest, self.starts[index] + self.deltas[index])
+            index += 1
+        return lowest
+
 
 class RangeFarm:
     def __init__(self, data: List[str], part: int = 1):
@@ -298,34 +422,48 @@ class RangeFarm:
             seeds = sorted(seeds, key=lambda r: r.start)
         return seeds
 
+    @cached_property
+    def seed_to_location(self) -> PiecewiseMap:
+        """Compose every almanac, from seed to location, into a single map."""
+        composed = PiecewiseMap.identity()
+        for almanac_map in self.almanac_chain():
+            composed = composed.compose(PiecewiseMap.from_almanac(almanac_map))
+        return composed
+
+    def almanac_chain(self) -> List[Almanac]:
+        """The almanacs in the order that takes a seed to its location."""
+        almanacs: Dict[str, Almanac] = {
+            almanac_map.source: almanac_map for almanac_map in self.maps
+        }
+        chain: List[Almanac] = []
+        current_type = "seed"
+        while current_type != "location":
+            chain.append(almanacs[current_type])
+            current_type = chain[-1].destination
+        return chain
+
+    def seed_locations(self, seeds: np.ndarray) -> np.ndarray:
+        """Map an array of seed numbers to their locations, one stage at a time."""
+        values = np.asarray(seeds, dtype=np.int64)
+        for almanac_map in self.almanac_chain():
+            values = almanac_map.convert(values)
+        return values
+
+    def location_ranges(self, seeds: List[Range]) -> RangeSet:
+        """Every location reachable from the seeds, propagated stage by stage."""
+        current_ranges = RangeSet(seeds)
+        for almanac_map in self.almanac_chain():
+            current_ranges = current_ranges.propagate(almanac_map.range_maps)
+        return current_ranges
+
+    def locations(self, seeds: List[Range]) -> List[int]:
+        # The minimum location of each seed range, since this is all we really
+        # care about
+        return [self.seed_to_location.lowest(seed) for seed in seeds]
+
     @property
-    def _locations(self) -> List[Range]:
-        locations: List[Range] = []
-        # For each seed range
-        for seed in self.seeds:
-            # Initialize the current type and range list
-            current_type = "seed"
-            current_ranges: List[Range] = [seed]
-            # Keep propagating the ranges until we arrive at "location"
-            while current_type != "location":
-                # Cycle through the maps until we find the one that matches
-                # the current type
-                for almanac_map in self.maps:
-                    if almanac_map.source == current_type:
-                        # Split current set of ranges into new set of ranges
-                        new_ranges: List[Range] = []
-                        for _range in current_ranges:
-                            new_ranges.extend(
-                                propagate_range(_range, almanac_map.range_maps)
-                            )
-                        # Update the current type and ranges
-                        current_type = almanac_map.destination
-                        current_ranges = new_ranges
-                        break
-            # Add the minimum location for the current ranges to the list
-            # since this is all we really care about
-            locations.append(min([r.start for r in current_ranges]))
-        return locations
+    def _locations(self) -> List[int]:
+        return self.locations(self.seeds)
 
     @property
     def lowest_location(self) -> int:
@@ -334,7 +472,8 @@ class RangeFarm:
 
 def part_one(data: List[str]) -> int:
     farm = RangeFarm(data, part=1)
-    return farm.lowest_location
+    seeds = np.array([seed.start for seed in farm.seeds], dtype=np.int64)
+    return int(farm.seed_locations(seeds).min())
 
 
 def part_two(data: List[str]) -> int:
@@ -342,6 +481,13 @@ def part_two(data: List[str]) -> int:
     return farm.lowest_location
 
 
+def part_two_ranges(data: List[str]) -> int:
+    # Pushes the whole seed ranges through every stage instead of composing the
+    # maps, as a cross-check on part_two
+    farm = RangeFarm(data, part=2)
+    return farm.location_ranges(farm.seeds).lowest
+
+
 if __name__ == "__main__":
     WORKING_DIR = Path(__file__).parent
     DATA = open(f"{WORKING_DIR}/data.csv", "r", encoding="utf-8").read().split("\n")
@@ -397,4 +543,5 @@ if __name__ == "__main__":
         f"Part Two (Test): {part_two(TEST_DATA)} (expected {PART_TWO_EXPECTED_OUTPUT})"
     )
     print(f"Part Two: {part_two(DATA)}")
+    print(f"Part Two (Range Sweep): {part_two_ranges(DATA)}")
     # Finished Part Two at 3:30PM CST
@@ -99,10 +99,18 @@ and beat the record, a total of 71503 ways!
 How many ways can you beat the record in this one much longer race?
 
 """
-from typing import List
+from typing import List, Sequence
 from pathlib import Path
 from functools import reduce
 from operator import mul
+import math
+
+import numpy as np
+
+# Largest race for which time^2 - 4 * distance and the root corrections fit in
+# an int64
+MAX_VECTORIZED_TIME: int = 2**31
+MAX_VECTORIZED_DISTANCE: int = 2**60
 
 
 class Race:
@@ -110,22 +118,60 @@ class Race:
         self.time = time
         self.distance = distance
 
-    def calculate_distances(self) -> List[int]:
-        # D = TIME * time_held - time_held^2
-        return [
-            self.time * time_held - time_held**2 for time_held in range(self.time)
-        ]
+    def wins(self, time_held: int) -> bool:
+        return self.time * time_held - time_held**2 > self.distance
 
     @property
     def winning_scenarios(self) -> int:
-        return sum([int(d > self.distance) for d in self.calculate_distances()])
+        # Winning hold times lie strictly between the roots of
+        # time_held^2 - TIME * time_held + DISTANCE = 0
+        discriminant = self.time**2 - 4 * self.distance
+        if discriminant <= 0:
+            return 0
+        # isqrt keeps this exact, and puts the first guess at most one below the
+        # shortest winning hold time
+        shortest = (self.time - math.isqrt(discriminant)) // 2
+        while shortest <= self.time // 2 and not self.wins(shortest):
+            shortest += 1
+        if not self.wins(shortest):
+            return 0
+        # The winning hold times are symmetric around TIME / 2
+        return self.time - 2 * shortest + 1
+
+
+def winning_scenarios(times: Sequence[int], distances: Sequence[int]) -> np.ndarray:
+    """Count the winning scenarios of many races at once."""
+    time_array = np.asarray(times, dtype=object)
+    distance_array = np.asarray(distances, dtype=object)
+    if time_array.size and (
+        max(times) >= MAX_VECTORIZED_TIME or max(distances) >= MAX_VECTORIZED_DISTANCE
+    ):
+        # Too large for int64, solve each race exactly with Python integers
+        return np.array(
+            [Race(t, d).winning_scenarios for t, d in zip(times, distances)],
+            dtype=object,
+        )
+
+    time_array = time_array.astype(np.int64)
+    distance_array = distance_array.astype(np.int64)
+    discriminant = time_array**2 - 4 * distance_array
+    root = np.sqrt(np.maximum(discriminant, 0)).astype(np.int64)
+    # Correct the float square root to the exact integer square root
+    root -= root**2 > discriminant
+    root += (root + 1) ** 2 <= discriminant
+
+    shortest = (time_array - root) // 2
+    for _ in range(2):
+        losing = shortest * (time_array - shortest) <= distance_array
+        shortest += losing & (shortest <= time_array // 2)
+    winning = (discriminant > 0) & (shortest * (time_array - shortest) > distance_array)
+    return np.where(winning, time_array - 2 * shortest + 1, 0)
 
 
 def part_one(data: List[str]) -> int:
     race_times = [int(time) for time in data[0].split()[1:]]
     race_distances = [int(distance) for distance in data[1].split()[1:]]
-    races: List[Race] = [Race(t, d) for t, d in zip(race_times, race_distances)]
-    score = reduce(mul, [r.winning_scenarios for r in races])
+    score = reduce(mul, winning_scenarios(race_times, race_distances).tolist())
     return score
 
 
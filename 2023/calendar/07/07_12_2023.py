@@ -124,11 +124,12 @@ Using the new joker rule, find the rank of every hand in your set. What are the
 total winnings?
 
 """
-from typing import List, Dict, Set
+from typing import List, Dict, Tuple, Iterator
 from pathlib import Path
-from itertools import combinations_with_replacement
+from collections import Counter
 from enum import Enum
-import pandas as pd
+
+import numpy as np
 
 
 card_dict: Dict[str, int] = {
@@ -147,6 +148,9 @@ card_dict: Dict[str, int] = {
     "2": 2,
 }
 
+# Bits used by each card value in a hand's sort key
+CARD_BITS: int = 4
+
 
 class HandType(Enum):
     HIGH_CARD = 1
@@ -167,9 +171,52 @@ class HandType(Enum):
         return self.value == other.value
 
 
+def signatures(card_count: int, largest: int = 5) -> Iterator[Tuple[int, ...]]:
+    """Every way to group a number of cards, as card counts sorted descending."""
+    if card_count == 0:
+        yield ()
+        return
+    for count in range(min(card_count, largest), 0, -1):
+        for rest in signatures(card_count - count, count):
+            yield (count,) + rest
+
+
+def best_hand_type(signature: Tuple[int, ...], joker_count: int) -> HandType:
+    # Jokers always do best joining the largest group of cards
+    counts = list(signature) or [0]
+    counts[0] += joker_count
+    return hand_type_by_squares[sum(count**2 for count in counts)]
+
+
+# Summing the squares of the card counts tells every hand type apart, e.g. a
+# full house is 3^2 + 2^2 = 13 and two pair is 2^2 + 2^2 + 1^2 = 9. The same
+# holds among the groupings of the non-joker cards, for any number of jokers.
+hand_type_by_squares: Dict[int, HandType] = {
+    5: HandType.HIGH_CARD,
+    7: HandType.ONE_PAIR,
+    9: HandType.TWO_PAIR,
+    11: HandType.THREE_OF_A_KIND,
+    13: HandType.FULL_HOUSE,
+    17: HandType.FOUR_OF_A_KIND,
+    25: HandType.FIVE_OF_A_KIND,
+}
+joker_hand_types: Dict[Tuple[Tuple[int, ...], int], HandType] = {
+    (signature, joker_count): best_hand_type(signature, joker_count)
+    for joker_count in range(6)
+    for signature in signatures(5 - joker_count)
+}
+# HAND_TYPE_TABLE[squares, joker_count] is the hand type value, where squares
+# is the sum of the squares of the non-joker card counts
+HAND_TYPE_TABLE: np.ndarray = np.zeros((26, 6), dtype=np.int64)
+for (signature, joker_count), hand_type in joker_hand_types.items():
+    HAND_TYPE_TABLE[
+        sum(count**2 for count in signature), joker_count
+    ] = hand_type.value
+
+
 class Hand:
     def __init__(self, cards_str: str, bet: int, part: int = 1) -> None:
-        self.cards = pd.Series([c for c in cards_str])
+        self.cards = cards_str
         self.part = part
         self.card_values: List[int] = [card_dict[c] for c in cards_str]
         # In part 2, J's are worth 1 for evaluation in the case of tied hand types
@@ -177,59 +224,25 @@ class Hand:
             self.card_values = [card_dict[c] if c != "J" else 1 for c in cards_str]
         self.bet = bet
         self.hand_type: HandType = self._parse_hand_type()
-        if self.part == 2:
-            # Get the number of jokers
-            joker_count = len([c for c in cards_str if c == "J"])
-            # Remove the J's from the card string
-            new_card_str = cards_str.replace("J", "")
-            # Get all possible unique combinations of cards that the jokers can make
-            joker_combos: List[str] = self._get_joker_combos(joker_count)
-            # Try them all out and see which hand type is best
-            best_hand_type: HandType = self.hand_type
-            for combo in joker_combos:
-                new_hand = Hand(new_card_str + combo, bet)
-                if new_hand.hand_type > best_hand_type:
-                    best_hand_type = new_hand.hand_type
-            self.hand_type = best_hand_type
-
-    def _get_joker_combos(self, joker_count: int) -> Set[str]:
-        combos = [
-            "".join(c)
-            for c in combinations_with_replacement("AKQT98765432", joker_count)
-        ]
-        return combos
 
     def _parse_hand_type(self) -> HandType:
-        counts = self.cards.value_counts()
-        if counts.max() == 5:
-            return HandType.FIVE_OF_A_KIND
-        elif counts.max() == 4:
-            return HandType.FOUR_OF_A_KIND
-        elif counts.max() == 3:
-            if counts.min() == 2:
-                return HandType.FULL_HOUSE
-            else:
-                return HandType.THREE_OF_A_KIND
-        elif counts.max() == 2:
-            if counts.value_counts()[2] == 2:
-                return HandType.TWO_PAIR
-            else:
-                return HandType.ONE_PAIR
-        else:
-            return HandType.HIGH_CARD
+        # In part 2, J's are jokers that join whichever group makes the best hand
+        jokers = "J" if self.part == 2 else ""
+        counts = Counter(c for c in self.cards if c not in jokers)
+        signature = tuple(sorted(counts.values(), reverse=True))
+        joker_count = len(self.cards) - sum(signature)
+        return joker_hand_types[signature, joker_count]
+
+    @property
+    def key(self) -> int:
+        """The hand type in the high bits, followed by each card's value."""
+        key = self.hand_type.value
+        for value in self.card_values:
+            key = (key << CARD_BITS) | value
+        return key
 
     def __lt__(self, other: "Hand"):
-        if self.hand_type < other.hand_type:
-            return True
-        elif self.hand_type > other.hand_type:
-            return False
-        else:
-            for i in range(5):
-                if self.card_values[i] < other.card_values[i]:
-                    return True
-                elif self.card_values[i] > other.card_values[i]:
-                    return False
-        return False
+        return self.key < other.key
 
     def __eq__(self, other: "Hand") -> bool:
         if self.card_values == other.card_values:
@@ -237,32 +250,60 @@ class Hand:
         return False
 
     def __gt__(self, other: "Hand"):
-        if not self < other and not self == other:
-            return True
-        return False
+        return self.key > other.key
 
     def __repr__(self) -> str:
-        return f"{self.cards.values} {self.hand_type} {self.bet}"
+        return f"{self.cards} {self.hand_type} {self.bet}"
+
+
+def parse_hands(data: List[str], part: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """Return an array of card values, one row of five per hand, and the bets."""
+    # Unknown cards look up -1, so they can be rejected rather than being
+    # mistaken for jokers
+    value_table = np.full(256, -1, dtype=np.int64)
+    for card, value in card_dict.items():
+        value_table[ord(card)] = value
+    if part == 2:
+        value_table[ord("J")] = 1
+    hands = [line.split() for line in data]
+    cards = "".join(hand for hand, _ in hands).encode()
+    card_values = value_table[np.frombuffer(cards, dtype=np.uint8)].reshape(-1, 5)
+    if (card_values < 0).any():
+        unknown = sorted({chr(c) for c in cards if value_table[c] < 0})
+        raise KeyError(f"Unknown cards {unknown}")
+    bets = np.array([int(bet) for _, bet in hands], dtype=np.int64)
+    return card_values, bets
+
+
+def hand_keys(card_values: np.ndarray, part: int = 1) -> np.ndarray:
+    """Compute the sort key of every hand at once, as `Hand.key` does for one."""
+    # Jokers are worth 1 in part 2, and no card is worth 0 in part 1
+    cards = card_values != (1 if part == 2 else 0)
+    joker_count = 5 - cards.sum(axis=1)
+    # How many (non-joker) cards of the hand match each card, summed, is the sum
+    # of the squares of the card counts
+    matches = card_values[:, :, None] == card_values[:, None, :]
+    matches &= cards[:, :, None] & cards[:, None, :]
+    keys = HAND_TYPE_TABLE[matches.sum(axis=(1, 2)), joker_count]
+    for column in range(5):
+        keys = (keys << CARD_BITS) | card_values[:, column]
+    return keys
+
+
+def total_winnings(keys: np.ndarray, bets: np.ndarray) -> int:
+    ranks = np.empty(len(keys), dtype=np.int64)
+    ranks[np.argsort(keys, kind="stable")] = np.arange(1, len(keys) + 1)
+    return int((bets * ranks).sum())
 
 
 def part_one(data: List[str]) -> int:
-    hands: List[Hand] = []
-    for line in data:
-        cards, bet = line.split()
-        hands.append(Hand(cards, int(bet)))
-    hands.sort()
-    score = sum([hand.bet * (i + 1) for i, hand in enumerate(hands)])
-    return score
+    card_values, bets = parse_hands(data)
+    return total_winnings(hand_keys(card_values), bets)
 
 
 def part_two(data: List[str]) -> int:
-    hands: List[Hand] = []
-    for line in data:
-        cards, bet = line.split()
-        hands.append(Hand(cards, int(bet), part=2))
-    hands.sort()
-    score = sum([hand.bet * (i + 1) for i, hand in enumerate(hands)])
-    return score
+    card_values, bets = parse_hands(data, part=2)
+    return total_winnings(hand_keys(card_values, part=2), bets)
 
 
 if __name__ == "__main__":
@@ -92,39 +92,222 @@ Simultaneously start on every node that ends with A. How many steps does it take
 you're only on nodes that end with Z?
 
 """
-from typing import List
+from typing import List, Dict, Callable, Set, Tuple, Optional
 from pathlib import Path
-from networkx import DiGraph
-from itertools import cycle
 from functools import reduce
+from dataclasses import dataclass
+from math import gcd
 
+import numpy as np
 
-def make_graph(data: List[str]) -> DiGraph:
-    g = DiGraph()
-    for line in data[2:]:
-        source_node, connected_nodes = line.split(" = ")
-        left_node, right_node = (
-            connected_nodes.replace("(", "").replace(")", "").split(", ")
+
+class DesertMap:
+    """The map compiled to integer node ids and successor arrays.
+
+    `transition[node]` is where a walk starting at `node` ends up after one full
+    pass through the instructions, and `jumps[k]` applies that pass 2^k times.
+    """
+
+    def __init__(self, data: List[str]):
+        self.directions: str = data[0]
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+        lefts: List[str] = []
+        rights: List[str] = []
+        for line in data[2:]:
+            source_node, connected_nodes = line.split(" = ")
+            left_node, right_node = (
+                connected_nodes.replace("(", "").replace(")", "").split(", ")
+            )
+            self.ids[source_node] = len(self.names)
+            self.names.append(source_node)
+            lefts.append(left_node)
+            rights.append(right_node)
+        self.left: np.ndarray = np.array([self.ids[n] for n in lefts], np.int64)
+        self.right: np.ndarray = np.array([self.ids[n] for n in rights], np.int64)
+        self.transition: np.ndarray = self.walk(np.arange(len(self.names)))
+        self.jumps: List[np.ndarray] = [self.transition]
+
+    def step(self, nodes: np.ndarray, instruction: int) -> np.ndarray:
+        if self.directions[instruction % len(self.directions)] == "L":
+            return self.left[nodes]
+        return self.right[nodes]
+
+    def walk(self, nodes: np.ndarray, steps: int = -1) -> np.ndarray:
+        """Follow the instructions from the first one, by default for one pass."""
+        steps = len(self.directions) if steps < 0 else steps
+        for instruction in range(steps):
+            nodes = self.step(nodes, instruction)
+        return nodes
+
+    def advance(self, nodes: np.ndarray, cycles: int) -> np.ndarray:
+        """Apply whole passes through the instructions in O(log cycles)."""
+        level = 0
+        while cycles:
+            if level == len(self.jumps):
+                self.jumps.append(self.jumps[-1][self.jumps[-1]])
+            if cycles & 1:
+                nodes = self.jumps[level][nodes]
+            cycles >>= 1
+            level += 1
+        return nodes
+
+    def position(self, start: str, steps: int) -> str:
+        """The node reached from `start` after any number of steps."""
+        cycles, remainder = divmod(steps, len(self.directions))
+        node = self.advance(np.array(self.ids[start]), cycles)
+        return self.names[int(self.walk(node, remainder))]
+
+    def pass_hits(self, is_target: Callable[[str], bool]) -> np.ndarray:
+        """`hits[k, node]` is whether step k of a pass starting at `node` is on a
+        target node.
+        """
+        targets = np.array([is_target(name) for name in self.names])
+        hits = np.zeros((len(self.directions), len(self.names)), dtype=bool)
+        nodes = np.arange(len(self.names))
+        for instruction in range(len(self.directions)):
+            hits[instruction] = targets[nodes]
+            nodes = self.step(nodes, instruction)
+        return hits
+
+    def first_arrival(self, start: str, is_target: Callable[[str], bool]) -> int:
+        """Steps from `start` until a target node is first reached, or -1."""
+        hits = self.pass_hits(is_target)
+        # For every node, the first step of a pass at which a target is reached
+        first_hit = np.where(hits.any(axis=0), hits.argmax(axis=0), -1)
+
+        node, steps, seen = self.ids[start], 0, set()
+        while node not in seen:
+            if first_hit[node] >= 0:
+                return steps + int(first_hit[node])
+            seen.add(node)
+            node = int(self.transition[node])
+            steps += len(self.directions)
+        return -1
+
+
+@dataclass
+class GhostCycle:
+    """The steps at which one ghost is on a target node.
+
+    Before `tail` steps the hits are listed in `tail_hits`. From then on the
+    walk repeats every `period` steps, hitting a target at `cycle_hits` (which
+    lie in [tail, tail + period)) plus any multiple of the period.
+    """
+
+    tail: int
+    period: int
+    tail_hits: List[int]
+    cycle_hits: List[int]
+
+    def __post_init__(self):
+        self._tail_hits: Set[int] = set(self.tail_hits)
+        self._cycle_hits: Set[int] = set(self.cycle_hits)
+
+    def hits(self, steps: int) -> bool:
+        if steps < self.tail:
+            return steps in self._tail_hits
+        return (steps - self.tail) % self.period + self.tail in self._cycle_hits
+
+
+def analyze_ghosts(
+    desert_map: DesertMap, starts: List[str], is_target: Callable[[str], bool]
+) -> List[GhostCycle]:
+    """Find the cycle of every ghost, walking all of them together a pass at a
+    time. The (node, instruction) state only repeats at the start of a pass, so
+    a ghost's cycle is found once its node at the start of a pass repeats.
+    """
+    hits = desert_map.pass_hits(is_target)
+    length = len(desert_map.directions)
+    node_count = len(desert_map.names)
+
+    nodes = np.array([desert_map.ids[start] for start in starts])
+    # first_seen[ghost, node] is the pass at which the ghost started at the node
+    first_seen = np.full((len(starts), node_count), -1)
+    history = np.zeros((node_count + 1, len(starts)), dtype=np.int64)
+    tails = np.full(len(starts), -1)
+    periods = np.full(len(starts), -1)
+    ghosts = np.arange(len(starts))
+    for pass_index in range(node_count + 1):
+        history[pass_index] = nodes
+        seen = first_seen[ghosts, nodes]
+        repeated = (tails < 0) & (seen >= 0)
+        tails[repeated] = seen[repeated]
+        periods[repeated] = pass_index - seen[repeated]
+        if (tails >= 0).all():
+            break
+        first_seen[ghosts, nodes] = np.where(seen >= 0, seen, pass_index)
+        nodes = desert_map.transition[nodes]
+
+    cycles: List[GhostCycle] = []
+    for ghost in range(len(starts)):
+        tail, period = int(tails[ghost]), int(periods[ghost])
+        steps_hit: List[int] = []
+        for pass_index in range(tail + period):
+            offsets = np.flatnonzero(hits[:, history[pass_index, ghost]])
+            steps_hit.extend((pass_index * length + offsets).tolist())
+        cycles.append(
+            GhostCycle(
+                tail=tail * length,
+                period=period * length,
+                tail_hits=[t for t in steps_hit if t < tail * length],
+                cycle_hits=[t for t in steps_hit if t >= tail * length],
+            )
         )
-        g.add_edge(source_node, left_node, L=True)
-        g.add_edge(source_node, right_node, R=True)
-    return g
+    return cycles
+
+
+def combine_congruences(
+    first: Tuple[int, int], second: Tuple[int, int]
+) -> Optional[Tuple[int, int]]:
+    """Generalized CRT: combine t = r1 (mod m1) and t = r2 (mod m2), where the
+    moduli need not be coprime. Returns (residue, modulus) or None.
+    """
+    (r1, m1), (r2, m2) = first, second
+    divisor = gcd(m1, m2)
+    if (r2 - r1) % divisor:
+        return None
+    reduced = m2 // divisor
+    factor = ((r2 - r1) // divisor) * pow(m1 // divisor, -1, reduced) % reduced
+    modulus = lcm([m1, m2])
+    return (r1 + m1 * factor) % modulus, modulus
+
+
+def first_common_hit(cycles: List[GhostCycle]) -> int:
+    """The first step at which every ghost is on a target node, or -1."""
+    if any(not c.tail_hits and not c.cycle_hits for c in cycles):
+        return -1
+    # Before the longest tail, check every hit of one ghost against the others
+    longest_tail = max(c.tail for c in cycles)
+    first = cycles[0]
+    steps = sorted(first.tail_hits)
+    for hit in first.cycle_hits:
+        steps.extend(range(hit, longest_tail, first.period))
+    for step in sorted(steps):
+        if step < longest_tail and all(c.hits(step) for c in cycles):
+            return step
+
+    # After it, every ghost is periodic, so combine their hits with the CRT
+    congruences: List[Tuple[int, int]] = [(0, 1)]
+    for c in cycles:
+        combined = [
+            combine_congruences(congruence, (hit % c.period, c.period))
+            for congruence in congruences
+            for hit in c.cycle_hits
+        ]
+        congruences = list({x for x in combined if x is not None})
+        if not congruences:
+            return -1
+    # Lift each residue to the first step at or after the longest tail
+    return min(
+        residue + max(0, -((residue - longest_tail) // modulus)) * modulus
+        for residue, modulus in congruences
+    )
 
 
 def part_one(data: List[str]) -> int:
-    directions = data[0]
-    start_node = "AAA"
-    destination_node = "ZZZ"
-    g = make_graph(data)
-
-    steps: int = 0
-    node = start_node
-    for d in cycle(directions):
-        if node == destination_node:
-            return steps
-        node = next(v for _, v, attr in g.edges(node, data=True) if attr.get(d))
-        steps += 1
-    return -1
+    desert_map = DesertMap(data)
+    return desert_map.first_arrival("AAA", lambda node: node == "ZZZ")
 
 
 def lcm(numbers: List[int]) -> int:
@@ -144,26 +327,10 @@ def lcm(numbers: List[int]) -> int:
 
 
 def part_two(data: List[str]) -> int:
-    directions = data[0]
-    g = make_graph(data)
-
-    current_nodes = [n for n in g.nodes if n.endswith("A")]
-    n_steps: List[int] = [0] * len(current_nodes)
-    steps_to_z: List[int] = [0] * len(current_nodes)
-    for d in cycle(directions):
-        if all(n.endswith("Z") for n in current_nodes):
-            return steps
-        for idx, node in enumerate(current_nodes):
-            current_nodes[idx] = next(
-                v for _, v, attr in g.edges(node, data=True) if attr.get(d)
-            )
-            n_steps[idx] += 1
-            if current_nodes[idx].endswith("Z"):
-                steps_to_z[idx] = n_steps[idx]
-        if all(steps_to_z):
-            steps = lcm(steps_to_z)
-            return steps
-    return -1
+    desert_map = DesertMap(data)
+    starts = [n for n in desert_map.names if n.endswith("A")]
+    cycles = analyze_ghosts(desert_map, starts, lambda node: node.endswith("Z"))
+    return first_common_hit(cycles)
 
 
 if __name__ == "__main__":
@@ -123,57 +123,78 @@ Analyze your OASIS report again, this time extrapolating the previous value for
 history. What is the sum of these extrapolated values?
 
 """
-from typing import List
+from typing import List, Dict, Tuple
 from pathlib import Path
+from functools import lru_cache
+from math import comb
 import numpy as np
-from functools import reduce
 
 
-EPS = 1e-6
+# Largest bit length an extrapolated value may reach to be computed in int64
+INT64_BITS: int = 62
 
 
-class AdventSequence:
-    def __init__(self, values: np.ndarray):
-        self.x = np.arange(len(values))
-        self.y = values
-        self.next_value = self._calculate_next_value()
-        self.previous_value = self._calculate_previous_value()
+@lru_cache(maxsize=None)
+def extrapolation_weights(length: int, exact: bool = False) -> np.ndarray:
+    """Weights that extrapolate a sequence of the given length by one value.
 
-    def _calculate_next_value(self) -> int:
-        diff_last_element: List[int] = [self.y[-1]]
-        diff = np.diff(self.y)
-        while not all([v == 0 for v in diff]):
-            diff_last_element.append(diff[-1])
-            diff = np.diff(diff)
-        return sum(diff_last_element)
+    Summing the last element of every level of differences is the same as
+    extrapolating the polynomial through all the values, which works out to
+    next = sum_k (-1)^(n - 1 - k) C(n, k) y_k and
+    previous = sum_k (-1)^k C(n, k + 1) y_k. Each column of the result holds one
+    set of weights, so a single matrix product gives both values. With `exact`,
+    the weights are Python integers that never overflow.
+    """
+    next_weights = [(-1) ** (length - 1 - k) * comb(length, k) for k in range(length)]
+    previous_weights = [(-1) ** k * comb(length, k + 1) for k in range(length)]
+    dtype = object if exact else np.int64
+    return np.array([next_weights, previous_weights], dtype=dtype).T
 
-    def _calculate_previous_value(self) -> int:
-        diff_first_element: List[int] = [self.y[0]]
-        diff = np.diff(self.y)
-        while not all([v == 0 for v in diff]):
-            diff_first_element.append(diff[0])
-            diff = np.diff(diff)
-        diff_first_element = diff_first_element[::-1]
-        previous_value = reduce(lambda x, y: y - x, diff_first_element)
-        return previous_value
+
+def fits_int64(values: List[int]) -> bool:
+    """Whether extrapolating the values is safe from int64 overflow.
+
+    The absolute weights of either extrapolation add up to 2^n - 1, so the
+    result and every partial sum stay below max|y| * 2^n.
+    """
+    largest = max((abs(v) for v in values), default=0)
+    return largest.bit_length() + len(values) <= INT64_BITS
 
 
 class SequenceStack:
     def __init__(self, lines: List[str]):
-        self.sequences: List[AdventSequence] = self._parse_sequences(lines)
-
-    def _parse_sequences(self, lines: List[str]) -> List[AdventSequence]:
-        sequences = []
+        self.sequences: Dict[Tuple[int, bool], np.ndarray] = self._parse_sequences(
+            lines
+        )
+        self.next_value, self.previous_value = self._extrapolate()
+
+    def _parse_sequences(self, lines: List[str]) -> Dict[Tuple[int, bool], np.ndarray]:
+        # Stack all sequences of the same length into one 2-D array. Sequences
+        # that could overflow int64 go into a separate, exact object array.
+        rows_by_key: Dict[Tuple[int, bool], List[List[int]]] = {}
         for line in lines:
-            values = np.array([int(v) for v in line.split(" ")])
-            sequences.append(AdventSequence(values))
-        return sequences
+            values = [int(v) for v in line.split()]
+            key = (len(values), not fits_int64(values))
+            rows_by_key.setdefault(key, []).append(values)
+        return {
+            (length, exact): np.array(rows, dtype=object if exact else np.int64)
+            for (length, exact), rows in rows_by_key.items()
+        }
+
+    def _extrapolate(self) -> Tuple[int, int]:
+        next_value, previous_value = 0, 0
+        for (length, exact), sequences in self.sequences.items():
+            values = sequences @ extrapolation_weights(length, exact)
+            # Add the rows up as Python integers, so the totals are exact too
+            next_value += sum(values[:, 0].tolist())
+            previous_value += sum(values[:, 1].tolist())
+        return next_value, previous_value
 
     def evaluate(self, part: int = 1) -> int:
         if part == 1:
-            return sum([s.next_value for s in self.sequences])
+            return self.next_value
         elif part == 2:
-            return sum([s.previous_value for s in self.sequences])
+            return self.previous_value
         else:
             raise ValueError(f"Invalid part {part}")
 
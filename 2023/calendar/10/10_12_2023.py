@@ -113,197 +113,79 @@ Here are the distances for each tile on that loop:
 Find the single giant loop starting at S. How many steps along the loop does it take to
 get from the starting position to the point farthest from the starting position?
 """
-from typing import List
+from typing import List, Dict, Tuple
 from pathlib import Path
-from networkx import Graph, DiGraph
-from shapely.geometry import Polygon, Point
-import networkx as nx
-
-
-def create_edge(graph: DiGraph, node_position: tuple, char: str) -> None:
-    if char == ".":
-        pass
-    elif char == "|":
-        if (node_position[0], node_position[1] - 1) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0], node_position[1] - 1),
-            )
-        if (node_position[0], node_position[1] + 1) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0], node_position[1] + 1),
-            )
-    elif char == "-":
-        if (node_position[0] - 1, node_position[1]) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0] - 1, node_position[1]),
-            )
-        if (node_position[0] + 1, node_position[1]) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0] + 1, node_position[1]),
-            )
-    elif char == "L":
-        if (node_position[0], node_position[1] - 1) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0], node_position[1] - 1),
-            )
-        if (node_position[0] + 1, node_position[1]) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0] + 1, node_position[1]),
-            )
-    elif char == "J":
-        if (node_position[0], node_position[1] - 1) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0], node_position[1] - 1),
-            )
-        if (node_position[0] - 1, node_position[1]) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0] - 1, node_position[1]),
-            )
-    elif char == "7":
-        if (node_position[0], node_position[1] + 1) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0], node_position[1] + 1),
-            )
-        if (node_position[0] - 1, node_position[1]) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0] - 1, node_position[1]),
-            )
-    elif char == "F":
-        if (node_position[0], node_position[1] + 1) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0], node_position[1] + 1),
-            )
-        if (node_position[0] + 1, node_position[1]) in graph.nodes:
-            graph.add_edge(
-                node_position,
-                (node_position[0] + 1, node_position[1]),
-            )
-    elif char == "S":
-        pass
-
-    return None
-
-
-def make_digraph(data: List[str]) -> DiGraph:
-    height = len(data)
-    width = len(data[0])
-    graph = DiGraph()
-    # Add a node for every position in the grid
-    for y in range(height):
-        for x in range(width):
-            graph.add_node((x, y), char=data[y][x])
-    # Now make the edges connect acording to the character of the node
-    for node in graph.nodes(data=True):
-        create_edge(graph, node[0], node[1]["char"])
-    return graph
-
-
-def digraph_to_graph(digraph: DiGraph) -> Graph:
-    # Now create a new graph that is undirected, that only has an edge if
-    # nodes are connected in both directions
-    graph = Graph()
-    for node in digraph.nodes(data=True):
-        graph.add_node(node[0], char=node[1]["char"])
-    for node in digraph.nodes(data=True):
-        if node[1]["char"] == "S":
-            # Look to see which edges connect TO the start node
-            # Connect back to them
-            for other_node in digraph.nodes:
-                if digraph.has_edge(other_node, node[0]):
-                    graph.add_edge(node[0], other_node)
-    for node in digraph.nodes:
-        for edge in digraph.edges(node):
-            if digraph.has_edge(edge[1], edge[0]):
-                graph.add_edge(edge[0], edge[1])
-    return graph
+
+
+NORTH, EAST, SOUTH, WEST = range(4)
+# The (x, y) step for each heading, with y growing downwards
+STEPS: List[Tuple[int, int]] = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+PIPE_CONNECTIONS: Dict[str, Tuple[int, int]] = {
+    "|": (NORTH, SOUTH),
+    "-": (EAST, WEST),
+    "L": (NORTH, EAST),
+    "J": (NORTH, WEST),
+    "7": (SOUTH, WEST),
+    "F": (SOUTH, EAST),
+}
+# TURNS[char * 4 + heading] is the heading after moving into a pipe, or -1 if the
+# pipe does not connect back to the tile we came from
+TURNS: List[int] = [-1] * 256 * 4
+for pipe, (first, second) in PIPE_CONNECTIONS.items():
+    TURNS[ord(pipe) * 4 + (first + 2) % 4] = second
+    TURNS[ord(pipe) * 4 + (second + 2) % 4] = first
+
+
+class PipeMaze:
+    def __init__(self, data: List[str]):
+        # Surround the maze with ground tiles so a walk can never leave the grid
+        self.width = max(len(row) for row in data) + 2
+        border = "." * self.width
+        rows = [border] + [f".{row}".ljust(self.width, ".") for row in data] + [border]
+        self.grid: bytes = "".join(rows).encode()
+        self.start: Tuple[int, int] = divmod(self.grid.index(b"S"), self.width)[::-1]
+
+    def _tile(self, x: int, y: int) -> int:
+        return self.grid[y * self.width + x]
+
+    def _start_heading(self) -> int:
+        x, y = self.start
+        for heading, (dx, dy) in enumerate(STEPS):
+            if TURNS[self._tile(x + dx, y + dy) * 4 + heading] >= 0:
+                return heading
+        raise ValueError("No pipe connects to the start tile")
+
+    def trace(self) -> Tuple[int, int]:
+        """Walk the loop from the start tile back to it, returning the loop length
+        and twice the area it encloses (shoelace formula).
+        """
+        x, y = self.start
+        heading = self._start_heading()
+        start_tile = ord("S")
+        length, double_area = 0, 0
+        while True:
+            dx, dy = STEPS[heading]
+            double_area += x * (y + dy) - (x + dx) * y
+            x, y = x + dx, y + dy
+            length += 1
+            tile = self._tile(x, y)
+            if tile == start_tile:
+                return length, abs(double_area)
+            heading = TURNS[tile * 4 + heading]
+            if heading < 0:
+                raise ValueError(f"The loop is broken at {(x - 1, y - 1)}")
 
 
 def part_one(data: List[str]) -> int:
-    dg = make_digraph(data)
-    g = digraph_to_graph(dg)
-    # Get the sub-graph that is connected to the start node
-    # Get the starting node:
-    for node in g.nodes(data=True):
-        if node[1]["char"] == "S":
-            start_node = node[0]
-            break
-    # This will be in a closed cyclical graph. Get just that sub-graph
-    connected_nodes = nx.node_connected_component(g, start_node)
-    return len(connected_nodes) // 2
+    length, _ = PipeMaze(data).trace()
+    return length // 2
 
 
 def part_two(data: List[str]) -> int:
-    dg = make_digraph(data)
-    g = digraph_to_graph(dg)
-
-    # Get the sub-graph that is connected to the start node
-    # Get the starting node:
-    for node in g.nodes(data=True):
-        if node[1]["char"] == "S":
-            start_node = node[0]
-            break
-    # This will be in a closed cyclical graph. Get just that sub-graph
-    connected_nodes = nx.node_connected_component(g, start_node)
-    sub_g = g.subgraph(connected_nodes)
-    vertices: List[tuple] = [start_node]
-
-    # Starting at the start node, follow the sub-graph throughone whole loop, saving
-    # the vertices
-    node = start_node
-    while True:
-        for edge in sub_g.edges(node):
-            if edge[0] not in vertices:
-                vertices.append(edge[0])
-                node = edge[0]
-                break
-            elif edge[1] not in vertices:
-                vertices.append(edge[1])
-                node = edge[1]
-                break
-        else:
-            break
-
-    poly = Polygon(vertices)
-
-    inside_count = 0
-    inside_points = []
-    for node in g.nodes:
-        if node not in sub_g.nodes and poly.contains(Point(node)):
-            inside_points.append(node)
-            inside_count += 1
-
-    import matplotlib.pyplot as plt
-
-    # Plot and save the polygon
-    _, ax = plt.subplots(figsize=(10, 10))
-    x, y = poly.exterior.xy
-    ax.plot(
-        x,
-        y,
-        color="#6699cc",
-    )
-    ax.scatter(
-        [x[0] for x in inside_points],
-        [x[1] for x in inside_points],
-        color="red",
-        marker="x",
-    )
-    ax.set_title(f"Polygon with {len(inside_points)} points inside")
-    WORKING_DIR = Path(__file__).parent
-    plt.savefig(WORKING_DIR / "polygon.png")
-
-    return inside_count
+    length, double_area = PipeMaze(data).trace()
+    # Pick's theorem: area = inside + boundary / 2 - 1, where the loop tiles are
+    # the boundary points
+    return (double_area - length) // 2 + 1
 
 
 if __name__ == "__main__":
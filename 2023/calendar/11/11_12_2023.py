@@ -127,75 +127,66 @@ Starting with the same initial image, expand the universe according to these new
 then find the length of the shortest path between every pair of galaxies. What is the
 sum of these lengths?
 """
-from typing import List
+from typing import List, Tuple, Iterable
 from pathlib import Path
-from itertools import combinations
 import numpy as np
-from scipy import sparse
-
-
-def make_universe(data: List[str]) -> sparse.lil_matrix:
-    # Create sparse array of universe
-    arr = sparse.lil_matrix((len(data), len(data[0])), dtype=np.int8)
-    for row, line in enumerate(data):
-        for col, char in enumerate(line):
-            if char == "#":
-                arr[row, col] = 1
-    return arr
-
-
-def expand_universe(universe: sparse.lil_matrix, factor: int = 2) -> sparse.lil_matrix:
-    empty_col_idx = np.where(universe.sum(axis=0) == 0)[1]
-    empty_row_idx = np.where(universe.sum(axis=1) == 0)[0]
-    for col in empty_col_idx[::-1]:
-        # Insert a new empty column after each empty column
-        universe = sparse.hstack(
-            [
-                universe[:, : col + 1],
-                sparse.lil_matrix((universe.shape[0], factor - 1)),
-                universe[:, col + 1 :],
-            ],
-            format="lil",
-        )
-    for row in empty_row_idx[::-1]:
-        # Insert a new empty row after each empty row
-        universe = sparse.vstack(
-            [
-                universe[: row + 1, :],
-                sparse.lil_matrix((factor - 1, universe.shape[1])),
-                universe[row + 1 :, :],
-            ],
-            format="lil",
-        )
-    return universe
 
 
-def part_one(data: List[str]) -> int:
-    universe = make_universe(data)
-    expanded_universe = expand_universe(universe)
-    rows, cols = expanded_universe.nonzero()
-    coords = list(zip(rows, cols))
-    combos = combinations(coords, 2)
-    total_distance = 0
-    for combo in combos:
-        # Calculate the manhattan distance
-        total_distance += sum(abs(a - b) for a, b in zip(*combo))
+def galaxy_coordinates(data: List[str]) -> Tuple[np.ndarray, ...]:
+    # Row and column of every galaxy. With no lines the grid is 1-D, and there
+    # is only one (empty) coordinate array
+    grid = np.array([list(line) for line in data if line]) == "#"
+    return np.nonzero(grid)
+
+
+def empty_lines_before(positions: np.ndarray) -> np.ndarray:
+    """How many empty lines come before each galaxy along one axis."""
+    # initial=-1 leaves occupied empty when there are no galaxies at all
+    occupied = np.zeros(positions.max(initial=-1) + 1, dtype=bool)
+    occupied[positions] = True
+    return np.cumsum(~occupied)[positions]
+
+
+def sum_of_distances(positions: np.ndarray) -> int:
+    """Sum |a - b| over every pair of positions along one axis.
+
+    Once sorted, the i-th position is at least as far along as the i before it,
+    so its distances to them add up to i * position - (sum of those before it).
+    """
+    ordered = np.sort(positions).astype(np.int64)
+    before = np.cumsum(ordered) - ordered
+    return int((np.arange(len(ordered)) * ordered - before).sum())
+
 
-    return total_distance
+class Universe:
+    """The total distance between galaxies, for any expansion factor.
+
+    A galaxy further along an axis never has fewer empty lines before it, so the
+    distance between two expanded galaxies is their original distance plus
+    (factor - 1) times the empty lines between them. Summed over every pair, the
+    total is base_distance + (factor - 1) * empty_lines_crossed.
+    """
+
+    def __init__(self, data: List[str]):
+        self.base_distance: int = 0
+        self.empty_lines_crossed: int = 0
+        for positions in galaxy_coordinates(data):
+            self.base_distance += sum_of_distances(positions)
+            self.empty_lines_crossed += sum_of_distances(empty_lines_before(positions))
+
+    def distance(self, factor: int = 2) -> int:
+        return self.base_distance + (factor - 1) * self.empty_lines_crossed
+
+    def distances(self, factors: Iterable[int]) -> List[int]:
+        return [self.distance(factor) for factor in factors]
+
+
+def part_one(data: List[str]) -> int:
+    return part_two(data, factor=2)
 
 
 def part_two(data: List[str], factor: int = 2) -> int:
-    universe = make_universe(data)
-    expanded_universe = expand_universe(universe, factor=factor)
-    rows, cols = expanded_universe.nonzero()
-    coords = list(zip(rows, cols))
-    combos = combinations(coords, 2)
-    total_distance = 0
-    for combo in combos:
-        # Calculate the manhattan distance
-        total_distance += sum(abs(a - b) for a, b in zip(*combo))
-
-    return total_distance
+    return Universe(data).distance(factor)
 
 
 if __name__ == "__main__":
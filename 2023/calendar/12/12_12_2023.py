@@ -141,11 +141,14 @@ After unfolding, adding all of the possible arrangement counts together produces
 Unfold your condition records; what is the new sum of possible arrangement counts?
 
 """
-from typing import List, Tuple
+from typing import List, Sequence, Iterable, Optional, Dict, Tuple
 from pathlib import Path
 from enum import Enum
+from functools import partial
+from multiprocessing import Pool
+
+import numpy as np
 from tqdm import tqdm
-import functools
 
 
 class Spring(Enum):
@@ -154,12 +157,6 @@ class Spring(Enum):
     UNKNOWN = "?"
 
 
-class Validity(Enum):
-    VALID = 1
-    INVALID = 0
-    UNKNOWN = -1
-
-
 class SpringRecord:
     def __init__(self, line: str, part: int = 1):
         self.part = part
@@ -167,36 +164,12 @@ class SpringRecord:
         self.springs: List[Spring] = []
         self.groups: List[int] = []
         self._parse_line(line)
-        self.valid: Validity = self._validate()
 
     def _parse_line(self, line: str):
         springs, groups = line.split(" ")
         self.springs = [Spring(s) for s in list(springs)]
         self.groups = [int(group) for group in groups.split(",")]
 
-    def _validate(self) -> Validity:
-        groups: List[int] = []
-        group_size: int = 0
-        for spring in self.springs:
-            if spring == Spring.BROKEN:
-                group_size += 1
-            elif Spring.UNKNOWN in self.springs:
-                return Validity.UNKNOWN
-            else:
-                if group_size > 0:
-                    if (
-                        len(groups) >= len(self.groups)
-                        or group_size != self.groups[len(groups)]
-                    ):
-                        return Validity.INVALID
-                    else:
-                        groups.append(group_size)
-                        group_size = 0
-        if group_size > 0:
-            groups.append(group_size)
-        if groups == self.groups:
-            return Validity.VALID
-
     def __str__(self) -> str:
         return (
             "".join([s.value for s in self.springs])
@@ -209,96 +182,44 @@ class SpringRecord:
 
     @property
     def combinations(self) -> int:
-
-        if self.valid == Validity.VALID:
-            # If there's no unknown springs and the groups match,
-            # there's only one combination
-            return 1
-        if Spring.UNKNOWN not in self.springs:
-            return 0
-
-        # Try replacing the first unknown spring with a working and broken spring
-        first_unknown = self.springs.index(Spring.UNKNOWN)
-
-        working_list = list(self.line)
-        working_list[first_unknown] = Spring.WORKING.value
-        working_str = "".join(working_list)
-        working = SpringRecord(working_str)
-
-        broken_list = list(self.line)
-        broken_list[first_unknown] = Spring.BROKEN.value
-        broken_str = "".join(broken_list)
-        broken = SpringRecord(broken_str)
-
-        combinations: int = 0
-        if working.valid != Validity.INVALID:
-            combinations += working.combinations
-        if broken.valid != Validity.INVALID:
-            combinations += broken.combinations
-
-        return combinations
-
-
-@functools.lru_cache(maxsize=None)
-def get_combinations(spring_record_str: str, groups: Tuple[int, ...]) -> int:
-
-    if len(groups) == 0:
-        # No more groups to check, so just need to check if there are possibly any
-        # more broken springs
-        if Spring.BROKEN.value in spring_record_str:
-            return 0
-        else:
-            return 1
-
-    if len(spring_record_str) == 0:
-        # womp womp
-        return 0
-
-    next_group = groups[0]
-    next_character = spring_record_str[0]
-
-    def working() -> int:
-        # Nothing to see here, onto the next substring
-        return get_combinations(spring_record_str[1:], groups)
-
-    def broken() -> int:
-        relevant_substr = spring_record_str[:next_group]
-
-        relevant_substr = relevant_substr.replace(
-            Spring.UNKNOWN.value, Spring.BROKEN.value
-        )
-
-        # Simple cases to check:
-        if relevant_substr != next_group * Spring.BROKEN.value:
-            # There are more broken springs than the group size
-            return 0
-
-        if len(spring_record_str) == next_group:
-            if len(groups) == 1:
-                # This is the last group, so we're done
-                return 1
-            else:
-                # There are more groups, but no more springs, so we're done
-                return 0
-
-        next_character = spring_record_str[next_group]
-        if next_character in [Spring.UNKNOWN.value, Spring.WORKING.value]:
-            # Make sure the next character could feasibly be a working spring
-            return get_combinations(spring_record_str[next_group + 1 :], groups[1:])
-
-        return 0
-
-    if next_character == Spring.BROKEN.value:
-        return broken()
-
-    elif next_character == Spring.WORKING.value:
-        return working()
-
-    elif next_character == Spring.UNKNOWN.value:
-        return working() + broken()
-
-    else:
-        raise ValueError(f"Unknown spring character {next_character}")
+        return count_arrangements("".join(s.value for s in self.springs), self.groups)
+
+
+def count_arrangements(springs: str, groups: Sequence[int]) -> int:
+    """Count the ways to fill in the unknown springs so the broken ones form the
+    given groups, with a DP over (group index, spring index).
+
+    ways[i] is the number of ways to arrange the remaining groups in springs[i:],
+    given that spring i - 1 (if any) is working. Rows are filled from the last
+    group back to the first, so only two rows are kept.
+    """
+    length = len(springs)
+    broken, working = Spring.BROKEN.value, Spring.WORKING.value
+
+    # run[i] is how many springs from i onwards could all be broken
+    run = [0] * (length + 1)
+    for i in range(length - 1, -1, -1):
+        run[i] = run[i + 1] + 1 if springs[i] != working else 0
+
+    # With no groups left, no broken spring may follow. Index length + 1 stands
+    # for "past the end", after a group that ends on the last spring.
+    ways = [0] * (length + 2)
+    ways[length] = ways[length + 1] = 1
+    for i in range(length - 1, -1, -1):
+        ways[i] = ways[i + 1] if springs[i] != broken else 0
+
+    next_ways = [0] * (length + 2)
+    for group in reversed(groups):
+        next_ways, ways = ways, next_ways
+        ways[length] = ways[length + 1] = 0
+        for i in range(length - 1, -1, -1):
+            total = ways[i + 1] if springs[i] != broken else 0
+            end = i + group
+            # Place the group at i if it fits and is not followed by a broken spring
+            if run[i] >= group and (end == length or springs[end] != broken):
+                total += next_ways[end + 1]
+            ways[i] = total
+    return ways[0]
 
 
 def part_one(data: List[str]) -> int:
@@ -309,18 +230,122 @@ def part_one(data: List[str]) -> int:
     return total
 
 
-def part_two(data: List[str]) -> int:
-    total: int = 0
-    for line in data:
-        spring_record_str, groups_str = line.split(" ")
-        spring_record_str = "?".join([spring_record_str] * 5)
-
-        groups = tuple(int(g) for g in groups_str.split(","))
-        groups = groups * 5
-
-        combinations = get_combinations(spring_record_str, groups)
-        total += combinations
-    return total
+# Below this many copies, running the DP over the fully unfolded record is
+# cheaper than building the per-copy transfers
+TRANSFER_MIN_COPIES: int = 8
+
+
+def copy_transfer(
+    springs: str, groups: Sequence[int], phase: int, run: int
+) -> Dict[Tuple[int, int], int]:
+    """Walk one copy of a record spring by spring, starting at group `phase` (of
+    the repeating group list) with `run` broken springs already in that group.
+
+    Returns how many ways the copy ends having completed `delta` more groups with
+    a run of `run` broken springs in progress, keyed by (delta, run).
+    """
+    broken, working = Spring.BROKEN.value, Spring.WORKING.value
+    states: Dict[Tuple[int, int], int] = {(0, run): 1}
+    for spring in springs:
+        next_states: Dict[Tuple[int, int], int] = {}
+        for (delta, run_length), count in states.items():
+            group = groups[(phase + delta) % len(groups)]
+            if spring != broken:
+                # A working spring is fine between groups, or right after a run
+                # that completes its group
+                if run_length == 0:
+                    key = (delta, 0)
+                elif run_length == group:
+                    key = (delta + 1, 0)
+                else:
+                    key = None
+                if key is not None:
+                    next_states[key] = next_states.get(key, 0) + count
+            if spring != working and run_length < group:
+                key = (delta, run_length + 1)
+                next_states[key] = next_states.get(key, 0) + count
+        states = next_states
+    return states
+
+
+def count_unfolded(springs: str, groups: Sequence[int], copies: int) -> int:
+    """Count the arrangements of a record unfolded into any number of copies.
+
+    The state between copies is (groups completed so far, broken springs in the
+    current run). What a copy does from a state only depends on which group of
+    the repeating list comes next, so the transfer of one copy is computed once
+    for every (phase, run) and then applied `copies` times to a state vector.
+    """
+    if not groups or copies < 1:
+        return count_arrangements("?".join([springs] * copies), groups)
+
+    period, total_groups = len(groups), len(groups) * copies
+    runs = max(groups) + 1
+    unit = "?" + springs
+    transfers = {
+        (phase, run): copy_transfer(unit, groups, phase, run)
+        for phase in range(period)
+        for run in range(groups[phase] + 1)
+    }
+
+    # states[j, run] counts the ways to have completed j groups with a run of
+    # broken springs in progress, after the first copy
+    states = np.zeros((total_groups + 1, runs), dtype=object)
+    for (delta, run), count in copy_transfer(springs, groups, 0, 0).items():
+        if delta <= total_groups:
+            states[delta, run] = count
+
+    # Only rows between lowest and highest can hold ways that still finish on
+    # the last group
+    most_per_copy = max((d for t in transfers.values() for d, _ in t), default=0)
+    lowest, highest = 0, min(total_groups, most_per_copy)
+    for copy in range(1, copies):
+        lowest = max(lowest, total_groups - 1 - (copies - copy) * most_per_copy)
+        next_states = np.zeros_like(states)
+        for (phase, run), transfer in transfers.items():
+            start = lowest + (phase - lowest) % period
+            sources = states[start : highest + 1 : period, run]
+            for (delta, next_run), count in transfer.items():
+                targets = next_states[start + delta :: period, next_run]
+                size = min(len(sources), len(targets))
+                targets[:size] += sources[:size] * count
+        states = next_states
+        highest = min(total_groups, highest + most_per_copy)
+
+    # Groups past the last one do not exist, so only count ways that finish
+    # exactly on the last group
+    last_group = groups[(total_groups - 1) % period]
+    return int(states[total_groups, 0] + states[total_groups - 1, last_group])
+
+
+def unfolded_combinations(line: str, copies: int = 5) -> int:
+    spring_record_str, groups_str = line.split(" ")
+    groups = [int(g) for g in groups_str.split(",")]
+    if copies >= TRANSFER_MIN_COPIES:
+        return count_unfolded(spring_record_str, groups, copies)
+    return count_arrangements("?".join([spring_record_str] * copies), groups * copies)
+
+
+def batch_combinations(
+    lines: Iterable[str],
+    copies: int = 5,
+    processes: Optional[int] = 1,
+    chunksize: int = 64,
+) -> List[int]:
+    """Count the combinations of many records in input order, across a process
+    pool if more than one process is asked for (None uses every CPU). Each
+    record's DP rows only live for the duration of its own count, so memory
+    stays flat however many records there are.
+    """
+    count = partial(unfolded_combinations, copies=copies)
+    if processes == 1:
+        return [count(line) for line in lines]
+    with Pool(processes) as pool:
+        return list(pool.imap(count, lines, chunksize=chunksize))
+
+
+def part_two(data: List[str], processes: Optional[int] = 1) -> int:
+    return sum(batch_combinations(data, processes=processes))
 
 
 if __name__ == "__main__":
@@ -340,7 +365,7 @@ if __name__ == "__main__":
 
     PART_ONE_EXPECTED_VALUE: int = 21
     print(f"Part One: {part_one(TEST_DATA)} (expected {PART_ONE_EXPECTED_VALUE})")
-    # print(f"Part One: {part_one(DATA)}")
+    print(f"Part One: {part_one(DATA)}")
 
     # Completed Part One at 11:15AM CST
 
@@ -146,78 +146,67 @@ second pattern's new horizontal line has 1 row above it, summarizing to the valu
 In each pattern, fix the smudge and find the different line of reflection. What number
 do you get after summarizing the new reflection line in each pattern in your notes?
 """
-from typing import List, Optional
+from typing import List, Optional, Iterable, Iterator
 from pathlib import Path
-import numpy as np
+from functools import cached_property, partial
+from itertools import islice
+from multiprocessing import Pool
+import os
+
+
+# Rocks become set bits
+ROCK_BITS = str.maketrans("#.", "10")
+
+
+def find_mirror(lines: List[int], smudges: int = 0) -> Optional[int]:
+    """Find where a list of row (or column) bitmasks is mirrored, with exactly
+    `smudges` cells differing between the two sides.
+    """
+    for line_ix in range(1, len(lines)):
+        differences = 0
+        for offset in range(min(line_ix, len(lines) - line_ix)):
+            before, after = lines[line_ix - 1 - offset], lines[line_ix + offset]
+            if before != after:
+                differences += bin(before ^ after).count("1")
+                if differences > smudges:
+                    break
+        if differences == smudges:
+            return line_ix
+    return None
 
 
 class LavaField:
     def __init__(self, data: List[str], part: int = 1) -> None:
         self.part = part
-        self.data = self._digitize(data)
-        self.height = self.data.shape[0]
-        self.width = self.data.shape[1]
-        self.horizontal_mirror: Optional[int] = self._find_horizontal_mirror()
-        self.vertical_mirror: Optional[int] = self._find_vertical_mirror()
-        self.smudged_horizontal_mirror: Optional[
-            int
-        ] = self._find_smudged_horizontal_mirror()
-        self.smudged_vertical_mirror: Optional[
-            int
-        ] = self._find_smudged_vertical_mirror()
-
-        if not self.horizontal_mirror and not self.vertical_mirror:
-            raise ValueError("No mirror found")
+        self.height = len(data)
+        self.width = len(data[0])
+        # Pack every row and column into an integer bitmask
+        self.rows: List[int] = [int(line.translate(ROCK_BITS), 2) for line in data]
+        self.columns: List[int] = [
+            int("".join(line[col_ix] for line in data).translate(ROCK_BITS), 2)
+            for col_ix in range(self.width)
+        ]
+
+        # Only the mirrors needed for this part are searched for
         self.score: int = self._calculate_score(part=self.part)
+        if not self.score:
+            raise ValueError("No mirror found")
 
-    def _digitize(self, data: List[str]) -> np.ndarray:
-        return np.array([[1 if c == "#" else 0 for c in line] for line in data])
-
-    def _find_horizontal_mirror(self) -> Optional[int]:
-        # Scan through for candidates
-        # A candidate is a row that is the same as the row below it
-        for row_ix in range(1, self.height):
-            chunk_size = min(row_ix, self.height - row_ix)
-            if np.array_equal(
-                self.data[row_ix - chunk_size : row_ix, :],
-                self.data[row_ix : row_ix + chunk_size, :][::-1, :],
-            ):
-                return row_ix
-
-        return None
-
-    def _find_vertical_mirror(self) -> Optional[int]:
-        for col_ix in range(1, self.width):
-            chunk_size = min(col_ix, self.width - col_ix)
-            if np.array_equal(
-                self.data[:, col_ix - chunk_size : col_ix],
-                self.data[:, col_ix : col_ix + chunk_size][:, ::-1],
-            ):
-                return col_ix
-        return None
-
-    def _find_smudged_horizontal_mirror(self) -> Optional[int]:
-        # Scan through for candidates
-        # A candidate is a row that is the same as the row below it
-        for row_ix in range(1, self.height):
-            chunk_size = min(row_ix, self.height - row_ix)
-            top = self.data[row_ix - chunk_size : row_ix, :]
-            bottom = self.data[row_ix : row_ix + chunk_size, :][::-1, :]
-            diff = np.abs(top - bottom)
-            if np.sum(diff) == 1:
-                return row_ix
-
-        return None
-
-    def _find_smudged_vertical_mirror(self) -> Optional[int]:
-        for col_ix in range(1, self.width):
-            chunk_size = min(col_ix, self.width - col_ix)
-            left = self.data[:, col_ix - chunk_size : col_ix]
-            right = self.data[:, col_ix : col_ix + chunk_size][:, ::-1]
-            diff = np.abs(left - right)
-            if np.sum(diff) == 1:
-                return col_ix
-        return None
+    @cached_property
+    def horizontal_mirror(self) -> Optional[int]:
+        return find_mirror(self.rows)
+
+    @cached_property
+    def vertical_mirror(self) -> Optional[int]:
+        return find_mirror(self.columns)
+
+    @cached_property
+    def smudged_horizontal_mirror(self) -> Optional[int]:
+        return find_mirror(self.rows, smudges=1)
+
+    @cached_property
+    def smudged_vertical_mirror(self) -> Optional[int]:
+        return find_mirror(self.columns, smudges=1)
 
     def _calculate_score(self, part: int = 1) -> int:
         score = 0
@@ -236,36 +225,52 @@ class LavaField:
         return score
 
 
-def part_one(data: List[str]) -> int:
-    lavafields: List[LavaField] = []
+def read_patterns(lines: Iterable[str]) -> Iterator[List[str]]:
+    """Yield one blank-line separated pattern at a time."""
     lavafield_lines: List[str] = []
-    for line in data:
+    for line in lines:
+        line = line.rstrip("\n")
         if line != "":
             lavafield_lines.append(line)
-        else:
-            lf = LavaField(lavafield_lines)
-            lavafields.append(lf)
+        elif lavafield_lines:
+            yield lavafield_lines
             lavafield_lines = []
     if lavafield_lines:
-        lavafields.append(LavaField(lavafield_lines))
-    score = sum([lf.score for lf in lavafields])
-    return score
+        yield lavafield_lines
 
 
-def part_two(data: List[str]) -> int:
-    lavafields: List[LavaField] = []
-    lavafield_lines: List[str] = []
-    for line in data:
-        if line != "":
-            lavafield_lines.append(line)
-        else:
-            lf = LavaField(lavafield_lines, part=2)
-            lavafields.append(lf)
-            lavafield_lines = []
-    if lavafield_lines:
-        lavafields.append(LavaField(lavafield_lines, part=2))
-    score = sum([lf.score for lf in lavafields])
-    return score
+def score_pattern(lavafield_lines: List[str], part: int = 1) -> int:
+    return LavaField(lavafield_lines, part=part).score
+
+
+def total_score(
+    lines: Iterable[str],
+    part: int = 1,
+    processes: Optional[int] = 1,
+    chunksize: int = 256,
+) -> int:
+    """Score patterns as they are read, so only one pattern (or, with several
+    processes, one batch of chunks) is held in memory at a time.
+    """
+    patterns = read_patterns(lines)
+    score = partial(score_pattern, part=part)
+    if processes == 1:
+        return sum(score(pattern) for pattern in patterns)
+
+    total: int = 0
+    batch_size = chunksize * (processes or os.cpu_count() or 1)
+    with Pool(processes) as pool:
+        while batch := list(islice(patterns, batch_size)):
+            total += sum(pool.map(score, batch, chunksize=chunksize))
+    return total
+
+
+def part_one(data: Iterable[str]) -> int:
+    return total_score(data, part=1)
+
+
+def part_two(data: Iterable[str]) -> int:
+    return total_score(data, part=2)
 
 
 if __name__ == "__main__":
@@ -127,11 +127,12 @@ beams is 64.
 Run the spin cycle for 1000000000 cycles. Afterward, what is the total load on the
 north support beams?
 """
-from typing import List
+from typing import List, Dict, Tuple
 from pathlib import Path
 from enum import Enum
-import functools
-from tqdm import tqdm
+
+
+SPIN_CYCLES: int = 1_000_000_000
 
 
 class PlatformObject(Enum):
@@ -147,34 +148,105 @@ class Direction(Enum):
     WEST = "W"
 
 
+# A run of cells between cube rocks: (mask, first bit, length)
+Segment = Tuple[int, int, int]
+
+
+def bitboard(lines: List[str], char: str) -> List[int]:
+    # Bit i of each line's integer is set when the i-th character is `char`
+    return [
+        sum(1 << i for i, line_char in enumerate(line) if line_char == char)
+        for line in lines
+    ]
+
+
+def transpose(lines: List[int], size: int) -> List[int]:
+    """Turn per-row bitboards into per-column ones, or the other way around."""
+    transposed = [0] * size
+    for i, line in enumerate(lines):
+        while line:
+            lowest = line & -line
+            transposed[lowest.bit_length() - 1] |= 1 << i
+            line ^= lowest
+    return transposed
+
+
+def segments(cubes: int, size: int) -> List[Segment]:
+    """Split a line of cells into the runs between its cube rocks."""
+    runs: List[Segment] = []
+    start = 0
+    for i in range(size + 1):
+        if i == size or cubes >> i & 1:
+            if i > start:
+                runs.append((((1 << (i - start)) - 1) << start, start, i - start))
+            start = i + 1
+    return runs
+
+
+def tilt_lines(
+    lines: List[int], line_segments: List[List[Segment]], toward_start: bool
+) -> None:
+    """Slide the round rocks of every line to one end of their segment."""
+    for i, line in enumerate(lines):
+        if not line:
+            continue
+        tilted = 0
+        for mask, start, length in line_segments[i]:
+            count = bin(line & mask).count("1")
+            if count:
+                offset = start if toward_start else start + length - count
+                tilted |= ((1 << count) - 1) << offset
+        lines[i] = tilted
+
+
 class Platform:
+    """Round and cube rocks stored as bitboards: bit `col` of `rows[row]` is set
+    when there is a round rock at (row, col).
+    """
+
     def __init__(self, data: List[str]) -> None:
         self.data = data
         self.width = len(data[0])
         self.height = len(data)
-        self.platform = self._create_platform()
+        self.rows: List[int] = bitboard(data, PlatformObject.ROUND.value)
+        self.cube_rows: List[int] = bitboard(data, PlatformObject.CUBE.value)
+        cube_columns = transpose(self.cube_rows, self.width)
+        self.row_segments = [segments(c, self.width) for c in self.cube_rows]
+        self.column_segments = [segments(c, self.height) for c in cube_columns]
+
+    @property
+    def state(self) -> Tuple[int, ...]:
+        return tuple(self.rows)
 
-    def _create_platform(self) -> List[List[int]]:
-        return [[PlatformObject(char) for char in row] for row in self.data]
+    def restore(self, state: Tuple[int, ...]) -> None:
+        self.rows = list(state)
 
     def __repr__(self) -> str:
         repr_str = ""
-        for row in self.platform:
-            repr_str += "".join([obj.value for obj in row]) + "\n"
+        for row in range(self.height):
+            repr_str += "".join(
+                [self._object(row, col).value for col in range(self.width)]
+            )
+            repr_str += "\n"
         return repr_str
 
     def __str__(self) -> str:
         return self.__repr__()
 
+    def _object(self, row: int, col: int) -> PlatformObject:
+        if self.rows[row] >> col & 1:
+            return PlatformObject.ROUND
+        if self.cube_rows[row] >> col & 1:
+            return PlatformObject.CUBE
+        return PlatformObject.EMPTY
+
     def tilt(self, direction: Direction) -> None:
-        if direction == Direction.NORTH:
-            self._tilt_north()
-        elif direction == Direction.SOUTH:
-            self._tilt_south()
-        elif direction == Direction.EAST:
-            self._tilt_east()
-        elif direction == Direction.WEST:
-            self._tilt_west()
+        if direction in (Direction.NORTH, Direction.SOUTH):
+            columns = transpose(self.rows, self.width)
+            tilt_lines(columns, self.column_segments, direction == Direction.NORTH)
+            self.rows = transpose(columns, self.height)
+        else:
+            tilt_lines(self.rows, self.row_segments, direction == Direction.WEST)
 
     def cycle(self, n: int = 1) -> None:
         for _ in range(n):
@@ -184,93 +256,37 @@ class Platform:
             self.tilt(Direction.EAST)
 
     def occupied(self, row: int, col: int) -> bool:
-        if self.platform[row][col] != PlatformObject.EMPTY:
-            return True
-        return False
-
-    def _tilt_north(self) -> None:
-        for row in range(1, self.height):
-            for col in range(self.width):
-                if self.platform[row][col] == PlatformObject.ROUND:
-                    check_rows = list(range(row))[::-1]
-                    min_row = row
-                    for check_row in check_rows:
-                        if not self.occupied(check_row, col):
-                            min_row = check_row
-                        else:
-                            break
-                    if min_row != row:
-                        self.platform[min_row][col] = PlatformObject.ROUND
-                        self.platform[row][col] = PlatformObject.EMPTY
-
-    def _tilt_south(self) -> None:
-        for row in list(range(self.height - 1))[::-1]:
-            for col in range(self.width):
-                if self.platform[row][col] == PlatformObject.ROUND:
-                    check_rows = list(range(row + 1, self.height))
-                    max_row = row
-                    # print(row, col, check_rows)
-                    for check_row in check_rows:
-                        if not self.occupied(check_row, col):
-                            max_row = check_row
-                        else:
-                            break
-                    if max_row != row:
-                        self.platform[max_row][col] = PlatformObject.ROUND
-                        self.platform[row][col] = PlatformObject.EMPTY
-
-    def _tilt_east(self) -> None:
-        for col in range(self.width - 1, -1, -1):
-            for row in range(self.height):
-                if self.platform[row][col] == PlatformObject.ROUND:
-                    check_cols = list(range(col + 1, self.width))
-                    max_col = col
-                    for check_col in check_cols:
-                        if not self.occupied(row, check_col):
-                            max_col = check_col
-                        else:
-                            break
-                    if max_col != col:
-                        self.platform[row][max_col] = PlatformObject.ROUND
-                        self.platform[row][col] = PlatformObject.EMPTY
-
-    def _tilt_west(self) -> None:
-        for col in range(1, self.width):
-            for row in range(self.height):
-                if self.platform[row][col] == PlatformObject.ROUND:
-                    check_cols = list(range(col))[::-1]
-                    min_col = col
-                    for check_col in check_cols:
-                        if not self.occupied(row, check_col):
-                            min_col = check_col
-                        else:
-                            break
-                    if min_col != col:
-                        self.platform[row][min_col] = PlatformObject.ROUND
-                        self.platform[row][col] = PlatformObject.EMPTY
-
-    def _row_count(self, row: int, object_type: PlatformObject) -> int:
-        return sum(
-            1 for col in range(self.width) if self.platform[row][col] == object_type
-        )
+        return self._object(row, col) != PlatformObject.EMPTY
 
     def score(self) -> int:
         score: int = 0
         for row in range(self.height):
             multiplier: int = self.height - row
-            score += multiplier * self._row_count(row, PlatformObject.ROUND)
+            score += multiplier * bin(self.rows[row]).count("1")
         return score
 
 
-@functools.lru_cache(maxsize=None)
-def cycle(platform_str: str, n: int = 1) -> None:
-    p = Platform(platform_str.splitlines())
-    for _ in range(n):
-        p.tilt(Direction.NORTH)
-        p.tilt(Direction.WEST)
-        p.tilt(Direction.SOUTH)
-        p.tilt(Direction.EAST)
-    return str(p)
+def spin(data: List[str], cycles: int = SPIN_CYCLES) -> Platform:
+    """Run the spin cycles until the platform repeats a configuration, then jump
+    straight to the state after `cycles` spin cycles.
+    """
+    p = Platform(data)
+    # history[i] is the platform after i spin cycles
+    history: List[Tuple[int, ...]] = []
+    seen: Dict[Tuple[int, ...], int] = {}
+    state = p.state
+    while state not in seen:
+        if len(history) == cycles:
+            return p
+        seen[state] = len(history)
+        history.append(state)
+        p.cycle()
+        state = p.state
+
+    preperiod = seen[state]
+    period = len(history) - preperiod
+    p.restore(history[preperiod + (cycles - preperiod) % period])
+    return p
 
 
 def part_one(data: List[str]) -> int:
@@ -280,13 +296,7 @@ def part_one(data: List[str]) -> int:
 
 
 def part_two(data: List[str]) -> int:
-    p = Platform(data)
-    p_str = str(p)
-    for _ in tqdm(range(10_000_000)):
-        p_str = cycle(p_str, n=100)
-
-    p = Platform(p_str.splitlines())
-
+    p = spin(data)
     return p.score()
 
 